@@ -9,126 +9,258 @@ Defaults:
     port = 2121
 """
 
+import atexit
 import logging
 import logging.handlers
 import threading
 import time
 import os
+import queue
+import re
 import secrets
 import sys
 import socket
 import sqlite3
+import struct
+import subprocess
 from pyftpdlib.authorizers import DummyAuthorizer
-from pyftpdlib.handlers import FTPHandler
+from pyftpdlib.handlers import DTPHandler, FTPHandler
 from pyftpdlib.servers import FTPServer
 
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
 
-def get_local_ip():
-    """Return the LAN IP address of this computer."""
+try:
+    import psutil  # optional: faster, portable interface enumeration
+except ImportError:
+    psutil = None
+
+try:
+    import netifaces  # optional: default-route lookup without opening a socket
+except ImportError:
+    netifaces = None
+
+
+# Local IP detection is comparatively expensive (sockets, subprocesses, DNS),
+# so get_all_local_ips() memoizes its result for a short time as a
+# (time.monotonic() timestamp, value) tuple.
+_IP_CACHE_TTL = 60.0
+_ip_cache = None
+
+
+def invalidate_ip_cache():
+    """Forget the cached IP lookup so the next call re-detects the network setup."""
+    global _ip_cache
+    _ip_cache = None
+
+
+# IPv4 address patterns for parsing `ipconfig`, `ip -4 addr` and `ifconfig` output
+_RE_IPCONFIG = re.compile(r"IPv4[^:\r\n]*[:\.]\s*(\d{1,3}(?:\.\d{1,3}){3})")
+_RE_IP_ADDR = re.compile(r"inet\s+(\d{1,3}(?:\.\d{1,3}){3})/")
+_RE_IFCONFIG = re.compile(r"inet\s+(\d{1,3}(?:\.\d{1,3}){3})")
+
+# Linux ioctl request number for reading an interface's IPv4 address
+_SIOCGIFADDR = 0x8915
+
+
+def _interface_ips():
+    """Return a set of IPv4 addresses of the local interfaces, found in-process.
+
+    Uses psutil when it is installed, otherwise SIOCGIFADDR ioctls on Linux.
+    Returns an empty set when neither is available (e.g. Windows without
+    psutil), so callers can fall back to parsing OS command output.
+    """
+    found = set()
+
+    if psutil is not None:
+        try:
+            for addrs in psutil.net_if_addrs().values():
+                for addr in addrs:
+                    if addr.family == socket.AF_INET:
+                        found.add(addr.address)
+            return found
+        except Exception:
+            found.clear()
+
+    if fcntl is not None and sys.platform.startswith("linux"):
+        try:
+            s = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        except Exception:
+            return found
+        try:
+            for _, ifname in socket.if_nameindex():
+                try:
+                    req = struct.pack('256s', ifname.encode()[:15])
+                    res = fcntl.ioctl(s.fileno(), _SIOCGIFADDR, req)
+                    found.add(socket.inet_ntoa(res[20:24]))
+                except OSError:
+                    # Interface without an IPv4 address (or down)
+                    continue
+        except Exception:
+            pass
+        finally:
+            s.close()
+
+    return found
+
+
+def _default_route_ip():
+    """Return the IPv4 address of the default-route interface via netifaces, or None."""
+    if netifaces is None:
+        return None
     try:
-        s = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
-        s.connect(("8.8.8.8", 80))
-        ip = s.getsockname()[0]
-        s.close()
-        return ip
+        iface = netifaces.gateways()['default'][netifaces.AF_INET][1]
+        return netifaces.ifaddresses(iface)[netifaces.AF_INET][0]['addr']
     except Exception:
-        return socket.gethostbyname(socket.gethostname())
+        return None
+
+
+def get_local_ip():
+    """Return the LAN IP address of this computer."""
+    return get_all_local_ips()[0]
 
 
 def get_all_local_ips():
-    """Return a sorted list of local IPv4 addresses (non-loopback).
+    """Return (primary_ip, sorted list of local non-loopback IPv4 addresses).
 
-    Strategy (in order):
-    1. UDP connect trick to discover primary outbound LAN IP.
-    2. Parse OS network command output (Windows: ipconfig, Linux/macOS: ip/ifconfig).
-    3. Hostname-based lookups (gethostbyname_ex/getaddrinfo) as fallback.
+    primary_ip is the outbound LAN address from step 1, or the first listed
+    address when that fails.
 
-    This avoids adding external dependencies and covers common OSes.
+    Strategy (in order):
+    1. Primary outbound LAN IP: default-route interface via netifaces if
+       installed, otherwise the UDP connect trick.
+    2. In-process interface enumeration (psutil if installed, ioctl on Linux).
+    3. Parse OS network command output (Windows: ipconfig, Linux/macOS: ip/ifconfig),
+       only when step 2 found no non-loopback address.
+    4. Hostname lookup (getaddrinfo), only when nothing but loopback was found.
+
+    This needs no external dependencies and covers common OSes. The result is
+    cached for _IP_CACHE_TTL seconds.
     """
-    import re
-    import subprocess
+    global _ip_cache
+    now = time.monotonic()
+    if _ip_cache is not None and now - _ip_cache[0] < _IP_CACHE_TTL:
+        return _ip_cache[1]
 
     ips = set()
+    primary = None
 
-    # 1) UDP trick
-    try:
-        s = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
-        s.connect(("8.8.8.8", 80))
-        ips.add(s.getsockname()[0])
-        s.close()
-    except Exception:
-        pass
-
-    # 2) Parse system command output
-    try:
-        if os.name == 'nt':
-            # Windows
-            out = subprocess.check_output(["ipconfig"], stderr=subprocess.DEVNULL)
-            text = out.decode(errors='ignore')
-            # Match IPv4 addresses
-            for m in re.findall(r"IPv4[^:\r\n]*[:\.]\s*([0-9]+(?:\.[0-9]+){3})", text):
-                ips.add(m)
-        else:
-            # Try `ip -4 addr` first (common on modern Linux)
-            try:
-                out = subprocess.check_output(["ip", "-4", "addr"], stderr=subprocess.DEVNULL)
+    def _add(ip):
+        # Drop loopback and empty entries as they are found; report whether kept
+        if ip and not ip.startswith("127."):
+            ips.add(ip)
+            return True
+        return False
+
+    # 1) Default-route interface from netifaces, else the UDP trick
+    primary = _default_route_ip()
+    if primary is None:
+        try:
+            s = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+            s.connect(("8.8.8.8", 80))
+            primary = s.getsockname()[0]
+            s.close()
+        except Exception:
+            pass
+    _add(primary)
+
+    # 2) Enumerate interfaces in-process
+    found_lan = False
+    for ip in _interface_ips():
+        found_lan = _add(ip) or found_lan
+
+    # 3) Parse system command output, only if step 2 found no usable address
+    if not found_lan:
+        try:
+            if os.name == 'nt':
+                # Windows
+                out = subprocess.check_output(["ipconfig"], stderr=subprocess.DEVNULL)
                 text = out.decode(errors='ignore')
-                for m in re.findall(r"inet\s+([0-9]+(?:\.[0-9]+){3})/", text):
-                    ips.add(m)
-            except Exception:
-                # Fallback to ifconfig
+                # Match IPv4 addresses
+                for m in _RE_IPCONFIG.findall(text):
+                    _add(m)
+            else:
+                # Try `ip -4 addr` first (common on modern Linux)
                 try:
-                    out = subprocess.check_output(["ifconfig"], stderr=subprocess.DEVNULL)
+                    out = subprocess.check_output(["ip", "-4", "addr"], stderr=subprocess.DEVNULL)
                     text = out.decode(errors='ignore')
-                    for m in re.findall(r"inet\s+([0-9]+(?:\.[0-9]+){3})", text):
-                        # On some systems 'inet 127.0.0.1' will appear; we'll filter later
-                        ips.add(m)
+                    for m in _RE_IP_ADDR.findall(text):
+                        _add(m)
                 except Exception:
-                    pass
-    except Exception:
-        pass
+                    # Fallback to ifconfig
+                    try:
+                        out = subprocess.check_output(["ifconfig"], stderr=subprocess.DEVNULL)
+                        text = out.decode(errors='ignore')
+                        for m in _RE_IFCONFIG.findall(text):
+                            _add(m)
+                    except Exception:
+                        pass
+        except Exception:
+            pass
 
-    # 3) Hostname lookups
-    try:
-        hostname = socket.gethostname()
-        for ip in socket.gethostbyname_ex(hostname)[2]:
-            ips.add(ip)
-    except Exception:
-        pass
+    # 4) Hostname lookup, only as a last resort: it may block on a slow resolver
+    if not ips:
+        try:
+            for res in socket.getaddrinfo(socket.gethostname(), None, socket.AF_INET,
+                                          flags=socket.AI_ADDRCONFIG):
+                _add(res[4][0])
+        except Exception:
+            pass
 
-    try:
-        for res in socket.getaddrinfo(socket.gethostname(), None):
-            if res and res[0] == socket.AF_INET:
-                ips.add(res[4][0])
-    except Exception:
-        pass
+    clean = sorted(ips) or ["127.0.0.1"]
+    result = (primary or clean[0], clean)
+    _ip_cache = (now, result)
+    return result
 
-    # Filter out loopback and empty
-    clean = sorted(p for p in ips if p and not p.startswith("127."))
-    if not clean:
-        clean = ["127.0.0.1"]
-    return clean
+
+# sqlite database holding persisted settings, stored next to this script
+DB_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "ftp_server.db")
+
+
+class TunedDTPHandler(DTPHandler):
+    """Data channel handler with larger I/O buffers for file transfers."""
+
+    # Bytes per recv()/send() call; pyftpdlib's default is 64 KiB
+    ac_in_buffer_size = 262144
+    ac_out_buffer_size = 262144
+
+
+class TunedFTPHandler(FTPHandler):
+    """FTPHandler using TunedDTPHandler for its data connections."""
+
+    dtp_handler = TunedDTPHandler
+
+
+def read_line(prompt):
+    """Print prompt and return the next stripped line from stdin.
+
+    Raises EOFError at end of input, like input().
+    """
+    print(prompt, end='', flush=True)
+    line = sys.stdin.readline()
+    if not line:
+        raise EOFError
+    return line.strip()
 
 
 def prompt_with_default(prompt, default):
     """Prompt the user with a default. Return the entered value or default if empty."""
     if default is None:
-        resp = input(f"{prompt}: ")
-        return resp.strip()
-    resp = input(f"{prompt} [{default}]: ")
-    return resp.strip() or default
+        return read_line(f"{prompt}: ")
+    return read_line(f"{prompt} [{default}]: ") or default
 
 
 def main():
     # Initialize sqlite DB for persistent settings
-    DB_PATH = os.path.join(os.path.dirname(__file__), "ftp_server.db")
+    # Keep one connection open for the whole run instead of reconnecting per
+    # setting access. Autocommit mode (isolation_level=None); the lock
+    # serializes use across threads.
+    db_conn = sqlite3.connect(DB_PATH, check_same_thread=False, isolation_level=None)
+    db_lock = threading.Lock()
 
     def init_db():
-        conn = sqlite3.connect(DB_PATH)
-        c = conn.cursor()
-        c.execute("CREATE TABLE IF NOT EXISTS settings (key TEXT PRIMARY KEY, value TEXT)")
-        # Remove any existing 'folder' entries to avoid persisting folder paths
-        c.execute("DELETE FROM settings WHERE key='folder'")
         # defaults
         defaults = {
             "username": "user",
@@ -136,69 +268,102 @@ def main():
             "port": "2121",
             # folder intentionally NOT persisted in DB for privacy/portability
         }
-        for k, v in defaults.items():
-            c.execute("INSERT OR IGNORE INTO settings(key,value) VALUES (?,?)", (k, str(v)))
-        conn.commit()
-        conn.close()
-
-    def get_setting(key, default=None):
-        conn = sqlite3.connect(DB_PATH)
-        c = conn.cursor()
-        c.execute("SELECT value FROM settings WHERE key=?", (key,))
-        row = c.fetchone()
-        conn.close()
-        return row[0] if row else default
+        with db_lock:
+            db_conn.execute("CREATE TABLE IF NOT EXISTS settings (key TEXT PRIMARY KEY, value TEXT)")
+            # The connection is in autocommit mode, so open the transaction explicitly;
+            # `with db_conn` commits it (or rolls back on error).
+            with db_conn:
+                db_conn.execute("BEGIN")
+                # Remove any existing 'folder' entries to avoid persisting folder paths
+                db_conn.execute("DELETE FROM settings WHERE key='folder'")
+                db_conn.executemany(
+                    "INSERT OR IGNORE INTO settings(key,value) VALUES (?,?)",
+                    [(k, str(v)) for k, v in defaults.items()],
+                )
+
+    def load_all_settings():
+        with db_lock:
+            return dict(db_conn.execute("SELECT key,value FROM settings").fetchall())
+
+    # Setting changes are written by a background thread so the menu never
+    # waits on the disk; writes queued close together share one transaction.
+    settings_queue = queue.Queue()
+
+    def settings_writer():
+        while True:
+            pending = [settings_queue.get()]
+            while True:
+                try:
+                    pending.append(settings_queue.get_nowait())
+                except queue.Empty:
+                    break
+            try:
+                with db_lock, db_conn:
+                    db_conn.execute("BEGIN")
+                    db_conn.executemany("INSERT OR REPLACE INTO settings(key,value) VALUES (?,?)", pending)
+            except Exception as e:
+                # Logging is disabled in interactive mode, so report on the console
+                keys = ", ".join(k for k, _ in pending)
+                print(f"\nFailed to save settings ({keys}): {e}", file=sys.stderr, flush=True)
+            finally:
+                for _ in pending:
+                    settings_queue.task_done()
 
     def set_setting(key, value):
-        conn = sqlite3.connect(DB_PATH)
-        c = conn.cursor()
-        c.execute("INSERT OR REPLACE INTO settings(key,value) VALUES (?,?)", (key, str(value)))
-        conn.commit()
-        conn.close()
+        settings_queue.put((key, str(value)))
 
     init_db()
+    settings = load_all_settings()
     # Support non-interactive mode via command-line flag only (--noninteractive)
     noninteractive = "--noninteractive" in sys.argv
 
     if noninteractive:
         # Read options from DB/defaults and optional positional args.
         # Positional args: [folder] [port]
-        folder_arg = None
-        port_arg = None
-        if len(sys.argv) > 1:
-            # find first arg that is not the --noninteractive flag
-            for a in sys.argv[1:]:
-                if a == "--noninteractive":
-                    continue
-                if not a.startswith("--") and folder_arg is None:
-                    folder_arg = a
-                elif not a.startswith("--") and port_arg is None:
-                    port_arg = a
-        folder = os.path.abspath(folder_arg or get_setting("folder", os.getcwd()))
-        port = int(port_arg) if port_arg and str(port_arg).isdigit() else int(get_setting("port", "2121"))
+        positional = [a for a in sys.argv[1:] if not a.startswith("--")]
+        folder_arg = positional[0] if positional else None
+        port_arg = positional[1] if len(positional) > 1 else None
+        folder = os.path.abspath(folder_arg or settings.get("folder", os.getcwd()))
+        port = int(port_arg) if port_arg and str(port_arg).isdigit() else int(settings.get("port", "2121"))
         host = "0.0.0.0"
-        username = get_setting("username", "user")
-        password = get_setting("password", "")
+        username = settings.get("username", "user")
+        password = settings.get("password", "")
         log_level = "INFO"
         log_file = None
+        # Settings are only read here; close the connection so it is not
+        # inherited by the pre-forked worker processes.
+        db_conn.close()
         logging.info("Starting in non-interactive mode (DB/defaults)")
     else:
         # Interactive mode: start server on default IP/port immediately without logs
-        folder = os.path.abspath(prompt_with_default("\nFolder to share", get_setting("folder", os.getcwd())))
+        threading.Thread(target=settings_writer, daemon=True).start()
+
+        def close_db():
+            # Flush queued writes, then close the connection before the interpreter exits
+            settings_queue.join()
+            with db_lock:
+                db_conn.close()
+
+        atexit.register(close_db)
+        folder = os.path.abspath(prompt_with_default("\nFolder to share", settings.get("folder", os.getcwd())))
         host = "0.0.0.0"
-        port = int(get_setting("port", "2121"))
-        username = get_setting("username", "user")
-        password = get_setting("password", "12345")
+        port = int(settings.get("port", "2121"))
+        username = settings.get("username", "user")
+        password = settings.get("password", "12345")
         # default: no log output
         log_level = "CRITICAL"
         log_file = None
         # TLS and passive ports removed - simpler defaults
 
         # Helper to create and start server in background thread
+        authorizer = None
+
         def create_server_instance(h, p, user, pwd, folder_path):
+            nonlocal authorizer
             auth = DummyAuthorizer()
             auth.add_user(user, pwd, folder_path, perm="elradfmwMT")
-            handler_cls = FTPHandler
+            authorizer = auth
+            handler_cls = TunedFTPHandler
             handler_cls.authorizer = auth
             try:
                 server = FTPServer((h, p), handler_cls)
@@ -218,52 +383,82 @@ def main():
 
         server = create_server_instance(host, port, username, password, folder)
         server_thread = None
+        server_stop = None
         server_running = False
 
         def start_server(srv):
-            nonlocal server_thread, server_running
+            nonlocal server_thread, server_stop, server_running
             if srv is None:
                 logging.error("Server instance is None, cannot start")
                 return
+            stop_event = threading.Event()
             def run():
                 try:
-                    srv.serve_forever()
+                    # Poll in short slices so a stop request is noticed promptly
+                    # instead of blocking in the IO loop until the next event.
+                    while not stop_event.is_set() and srv.ioloop.socket_map:
+                        srv.ioloop.loop(timeout=0.1, blocking=False)
                 except Exception as e:
                     logging.error("Server stopped with error: %s", e)
+                finally:
+                    # Close sockets from the thread that runs the IO loop
+                    try:
+                        srv.close_all()
+                    except Exception:
+                        pass
+            server_stop = stop_event
             server_thread = threading.Thread(target=run, daemon=True)
             server_thread.start()
             server_running = True
 
         def stop_server(srv):
             nonlocal server_thread, server_running
-            if srv:
+            if server_thread and server_thread.is_alive():
+                server_stop.set()
+                # Returns as soon as the loop notices the event (~0.1s);
+                # the timeout is only a safety net.
+                server_thread.join(timeout=2)
+            elif srv:
                 try:
                     srv.close_all()
                 except Exception:
                     pass
-            if server_thread:
-                server_thread.join(timeout=2)
             server_running = False
 
+        # Credentials live in the authorizer, so they are changed in place
+        # without rebinding. The IO loop thread reads the authorizer
+        # concurrently, so each change keeps a valid entry at every moment.
+        def rename_user(old_user):
+            # Add the new name before dropping the old one. Sessions still
+            # logged in under the old name are disconnected on their next command.
+            authorizer.add_user(username, password, folder, perm="elradfmwMT")
+            if authorizer.has_user(old_user):
+                authorizer.remove_user(old_user)
+
+        def change_password():
+            # A single dict assignment; connected sessions are unaffected
+            authorizer.user_table[username]["pwd"] = password
+
         # Start server initially
         if server:
             start_server(server)
             print(f"Server started on {host}:{port} (user: {username}) -- no logging by default")
             # Show detected local IPs and recommended access URLs at runtime
             try:
-                local_ip = get_local_ip()
-                all_ips = get_all_local_ips()
-                # Print short summary to console for interactive users
-                print("Detected local IPs:", ", ".join(all_ips))
-                # concise output for easy copy/paste in cmd
-                print(" ")
-                print(f"ip: {local_ip}")
-                print(f"port: {port}")
-                print(f"username: {username}")
-                print(f"password: {password}")
-                print(" ")
-                
-                print(f"Listening on {host}:{port} (bind address). Primary outbound IP: {local_ip}")
+                local_ip, all_ips = get_all_local_ips()
+                # Short summary for interactive users, with concise lines for
+                # easy copy/paste in cmd; written in one go
+                sys.stdout.write(
+                    f"Detected local IPs: {', '.join(all_ips)}\n"
+                    " \n"
+                    f"ip: {local_ip}\n"
+                    f"port: {port}\n"
+                    f"username: {username}\n"
+                    f"password: {password}\n"
+                    " \n"
+                    f"Listening on {host}:{port} (bind address). Primary outbound IP: {local_ip}\n"
+                )
+                sys.stdout.flush()
             except Exception:
                 # Don't break startup if IP detection fails
                 pass
@@ -273,45 +468,34 @@ def main():
         # Interactive menu loop
         while True:
             print("\nOptions:\n1) Change username\n2) Change password\n3) Change port\n4) Change folder\n5) Restart server\n6) Show credentials\n7) Stop server and exit")
-            choice = input("Select option (1-7): ").strip()
+            choice = read_line("Select option (1-7): ")
             if choice == "1":
-                new_user = input("\nNew username: ").strip()
-                if new_user:
+                new_user = read_line("\nNew username: ")
+                if new_user == username:
+                    print("Username unchanged")
+                elif new_user:
+                    old_user = username
                     username = new_user
-                    # Restart to apply new credentials immediately
-                    print(f"Username changed to: {username} - restarting server...")
-                    try:
-                        stop_server(server)
-                    except Exception:
-                        pass
-                    server = create_server_instance(host, port, username, password, folder)
-                    if server:
-                        start_server(server)
-                        print(f"Server restarted on {host}:{port} (user: {username})")
-                    else:
-                        print("Failed to restart server after username change.")
+                    # Apply new credentials immediately, no restart needed
+                    rename_user(old_user)
+                    print(f"Username changed to: {username}")
                     # persist change
                     set_setting("username", username)
             elif choice == "2":
-                new_pass = input("\nNew password: ").strip()
-                if new_pass:
+                new_pass = read_line("\nNew password: ")
+                if new_pass == password:
+                    print("Password unchanged")
+                elif new_pass:
                     password = new_pass
-                    print("Password updated - restarting server...")
-                    try:
-                        stop_server(server)
-                    except Exception:
-                        pass
-                    server = create_server_instance(host, port, username, password, folder)
-                    if server:
-                        start_server(server)
-                        print(f"Server restarted on {host}:{port} (user: {username})")
-                    else:
-                        print("Failed to restart server after password change.")
+                    change_password()
+                    print("Password updated")
                     # persist change
                     set_setting("password", password)
             elif choice == "3":
-                new_port = input(f"\nNew port (current {port}): ").strip()
-                if new_port.isdigit():
+                new_port = read_line(f"\nNew port (current {port}): ")
+                if new_port.isdigit() and int(new_port) == port and server:
+                    print("Port unchanged")
+                elif new_port.isdigit():
                     port = int(new_port)
                     print(f"Port set to {port} - restarting now...")
                     # Restart server immediately to apply new port
@@ -328,9 +512,14 @@ def main():
                 else:
                     print("Invalid port")
             elif choice == "4":
-                new_folder = input(f"\nNew folder (current {folder}): ").strip()
+                new_folder = read_line(f"\nNew folder (current {folder}): ")
                 if new_folder:
-                    folder = os.path.abspath(new_folder)
+                    # Already absolute when re-entering the current folder
+                    new_folder = new_folder if new_folder == folder else os.path.abspath(new_folder)
+                if new_folder and new_folder == folder and server:
+                    print("Folder unchanged")
+                elif new_folder:
+                    folder = new_folder
                     print(f"Folder set to {folder} - restarting server...")
                     try:
                         stop_server(server)
@@ -345,6 +534,8 @@ def main():
                     # Do not persist folder to DB (user requested not to save folder path)
             elif choice == "5":
                 print("\nRestarting server with current settings...")
+                # An explicit restart is a good moment to re-detect network changes
+                invalidate_ip_cache()
                 try:
                     stop_server(server)
                 except Exception:
@@ -363,13 +554,13 @@ def main():
                     primary_ip = get_local_ip()
                 except Exception:
                     primary_ip = None
-                if primary_ip:
-                    print(f"\nip: {primary_ip}")
-                else:
-                    print("\nip: (unknown)")
-                print(f"port: {port}")
-                print(f"username: {username}")
-                print(f"password: {password}")
+                sys.stdout.write(
+                    f"\nip: {primary_ip or '(unknown)'}\n"
+                    f"port: {port}\n"
+                    f"username: {username}\n"
+                    f"password: {password}\n"
+                )
+                sys.stdout.flush()
             elif choice == "7":
                 print("\nStopping server and exiting...")
                 try:
@@ -424,13 +615,12 @@ def main():
 
     authorizer.add_user(username, password, folder, perm="elradfmwMT")
 
-    # Use plain FTPHandler (TLS/passive-port support removed)
-    handler = FTPHandler
+    # Use plain FTP (TLS/passive-port support removed) with larger data socket buffers
+    handler = TunedFTPHandler
     handler.authorizer = authorizer
 
     # --- Determine IP ---
-    local_ip = get_local_ip()
-    all_ips = get_all_local_ips()
+    local_ip, all_ips = get_all_local_ips()
 
     # --- Display info ---
     logging.info("FTP server configured to bind %s:%d", host, port)
@@ -441,21 +631,50 @@ def main():
 
     # Also print concise info to console so users can easily copy/paste from cmd
     try:
-        # Primary outbound IP (single) and core connection info in simple lines
-        print(f"ip: {local_ip}")
-        print(f"port: {port}")
-        print(f"username: {username}")
-        print(f"password: {password}")
-        # Print all detected local IPs too (comma-separated)
-        print("all_ips: ", ", ".join(all_ips))
+        # Primary outbound IP (single) and core connection info in simple lines,
+        # plus all detected local IPs (comma-separated); written in one go
+        sys.stdout.write(
+            f"ip: {local_ip}\n"
+            f"port: {port}\n"
+            f"username: {username}\n"
+            f"password: {password}\n"
+            f"all_ips:  {', '.join(all_ips)}\n"
+        )
+        sys.stdout.flush()
     except Exception:
         pass
 
     # --- Start server ---
-    # Create and run server
+    # Create and run server. On POSIX, pre-fork one worker per CPU: the workers
+    # share the listening socket and the kernel spreads accept() across them.
+    # pyftpdlib ignores worker_processes on Windows and serves from one process.
     server = FTPServer((host, port), handler)
+    # Respect CPU affinity (e.g. a container pinned to a few cores) where supported
+    if hasattr(os, "sched_getaffinity"):
+        workers = len(os.sched_getaffinity(0))
+    else:
+        workers = os.cpu_count() or 1
+    if workers > 1 and os.name == 'posix':
+        # The limit applies per worker; with 2+ workers the total stays at or
+        # above pyftpdlib's single-process default of 512.
+        server.max_cons = 256
+        # Scheduled before forking so every worker inherits it: stop serving
+        # once the parent is gone (e.g. it was sent SIGTERM) instead of
+        # lingering as an orphan holding the port.
+        parent_pid = os.getpid()
+
+        def exit_if_orphaned():
+            if os.getppid() != parent_pid:
+                server.close_all()
+
+        server.ioloop.call_every(1.0, exit_if_orphaned)
+        # Wake the IO loop at least once a second so the check also runs while
+        # a worker is idle (with no timeout the loop blocks until I/O arrives).
+        poll_timeout = 1.0
+    else:
+        poll_timeout = None
     try:
-        server.serve_forever()
+        server.serve_forever(timeout=poll_timeout, worker_processes=workers)
     except KeyboardInterrupt:
         logging.info("Shutting down server")
 